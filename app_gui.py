@@ -1,17 +1,61 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from datetime import datetime
+from concurrent.futures import Future
+import configparser
+import logging
+import queue
 import threading
 import webbrowser
-import json
 import os
+from urllib.parse import urlencode
+
+from utils.cache import cache_key, load_cached, save_cached
+from utils.date_input import parse_day
+from utils.json_utils import dump_reviews
+
+_SOURCES = ("g2", "capterra")
+
+_CAPTERRA_SEARCH_URL = "https://www.capterra.in/search/product"
+
+_SETTINGS_PATH = os.path.expanduser("~/.pulse_scraper.ini")
+
+
+def _submit(fn, *args):
+    # Daemon threads rather than a ThreadPoolExecutor, whose workers are joined
+    # at exit: closing the window must end the process, not wait for a scrape.
+    # The driver pools cap how many browsers run at once.
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="scraper", daemon=True).start()
+    return future
+
+
+def _load_scrapers():
+    # The scrapers pull in selenium and undetected_chromedriver; importing them
+    # on a worker lets the window appear first.
+    from scrapers.g2 import scrape_g2
+    from scrapers.capterra import scrape_capterra
+    return {"g2": scrape_g2, "capterra": scrape_capterra}
+
 
 class ReviewScraperApp:
     def __init__(self, root):
         self.root = root
         self.root.title("SaaS Review Scraper")
+        self._msgq = queue.Queue()
+        self._scrapers = _submit(_load_scrapers)
 
         self._build_gui()
+        self._load_last_inputs()
+        self._drain()
 
     def _build_gui(self):
         padding = {"padx": 10, "pady": 5}
@@ -37,9 +81,9 @@ class ReviewScraperApp:
         # Source Dropdown
         ttk.Label(self.root, text="Source:").grid(row=3, column=0, sticky="w", **padding)
         self.source_var = tk.StringVar()
-        self.source_combo = ttk.Combobox(self.root, textvariable=self.source_var, values=["g2", "capterra"])
-        self.source_combo.grid(row=3, column=1, **padding)
-        self.source_combo.set("")  # force user to choose
+        # default "" forces the user to choose
+        self.source_menu = ttk.OptionMenu(self.root, self.source_var, "", *_SOURCES)
+        self.source_menu.grid(row=3, column=1, sticky="we", **padding)
 
         # Scrape Button
         self.scrape_button = ttk.Button(self.root, text="Scrape Reviews", command=self.start_scraping)
@@ -49,11 +93,39 @@ class ReviewScraperApp:
         self.status_label = ttk.Label(self.root, text="", foreground="blue")
         self.status_label.grid(row=5, columnspan=3, pady=(5, 10))
 
+    def _load_last_inputs(self):
+        cfg = configparser.ConfigParser(interpolation=None)
+        try:
+            cfg.read(_SETTINGS_PATH, encoding="utf-8")
+        except (OSError, UnicodeDecodeError, configparser.Error):
+            # a corrupt file only costs the remembered inputs
+            cfg = configparser.ConfigParser(interpolation=None)
+        self.company_entry.insert(0, cfg.get("last", "company", fallback=""))
+        self.start_entry.insert(0, cfg.get("last", "start_date", fallback=""))
+        self.end_entry.insert(0, cfg.get("last", "end_date", fallback=""))
+        source = cfg.get("last", "source", fallback="")
+        if source in _SOURCES:
+            self.source_var.set(source)
+
+    def _save_last_inputs(self, company, start_date, end_date, source):
+        cfg = configparser.ConfigParser(interpolation=None)
+        cfg["last"] = {
+            "company": company,
+            "start_date": start_date,
+            "end_date": end_date,
+            "source": source,
+        }
+        try:
+            with open(_SETTINGS_PATH, "w", encoding="utf-8") as f:
+                cfg.write(f)
+        except OSError:
+            pass  # remembering inputs is a convenience, never a reason to fail
+
     def open_capterra_search(self):
         query = self.company_entry.get().strip()
         if query:
-            url = f"https://www.capterra.in/search/product?q={query}"
-            webbrowser.open(url)
+            url = f"{_CAPTERRA_SEARCH_URL}?{urlencode({'q': query})}"
+            webbrowser.open(url, new=2)
 
     def start_scraping(self):
         company = self.company_entry.get().strip().lower()
@@ -66,50 +138,96 @@ class ReviewScraperApp:
             messagebox.showerror("Missing Info", "All fields are required.")
             return
 
+        if not any(ch.isalnum() for ch in company):
+            messagebox.showerror("Invalid Company", "Company name must contain letters or digits.")
+            return
+
         try:
-            datetime.strptime(start_date, "%Y-%m-%d")
-            datetime.strptime(end_date, "%Y-%m-%d")
+            start = parse_day(start_date)
+            end = parse_day(end_date)
         except ValueError:
             messagebox.showerror("Invalid Date", "Dates must be in YYYY-MM-DD format.")
             return
 
-        self.status_label.config(text="⏳ Scraping in progress...", foreground="orange")
+        if start > end:
+            messagebox.showerror("Invalid Date", "Start date must not be after end date.")
+            return
 
-        threading.Thread(
-            target=self.run_scraper,
-            args=(company, start_date, end_date, source),
-            daemon=True
-        ).start()
+        self._save_last_inputs(company, start_date, end_date, source)
+        self.status_label.config(text="⏳ Scraping in progress...", foreground="orange")
 
-    def run_scraper(self, company, start_date, end_date, source):
-        try:
-            
-            start = datetime.strptime(start_date, "%Y-%m-%d")
-            end = datetime.strptime(end_date, "%Y-%m-%d")
-
-            if source == "g2":
-                from scrapers.g2 import scrape_g2
-                reviews = scrape_g2(company, start, end)
-            elif source == "capterra":
-                from scrapers.capterra import scrape_capterra
-                reviews = scrape_capterra(company, start, end)
+        future = _submit(self.run_scraper, company, start, end, source)
+        future.add_done_callback(self._on_scrape_done)
+
+    # Worker threads never touch Tk directly: they post to self._msgq and
+    # _drain applies the messages on the Tk thread.
+    def _on_scrape_done(self, future):
+        self._msgq.put(("done", future))
+
+    def _report_progress(self, page, count):
+        self._msgq.put(("status", f"⏳ Scraping page {page} ({count} reviews so far)..."))
+
+    def _drain(self):
+        status = None
+        while True:
+            try:
+                kind, payload = self._msgq.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "status":
+                # Only the latest progress message is worth drawing.
+                status = payload
             else:
-                raise Exception("Unknown source selected.")
+                status = None
+                self._show_result(payload)
 
-            os.makedirs("output", exist_ok=True)
-            filename = f"output/{company}_{source}_reviews.json"
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(reviews, f, indent=2, ensure_ascii=False)
+        if status:
+            self.status_label.config(text=status, foreground="orange")
+        self.root.after(50, self._drain)
 
-            self.status_label.config(
-                text=f"✅ Saved {len(reviews)} reviews to {filename}", foreground="green"
-            )
+    def _show_result(self, future):
+        try:
+            count, filename = future.result()
         except Exception as e:
             self.status_label.config(text="❌ Failed: " + str(e), foreground="red")
             messagebox.showerror("Error", str(e))
+            return
+
+        if filename is None:
+            self.status_label.config(text="No reviews found", foreground="blue")
+            return
+
+        self.status_label.config(
+            text=f"✅ Saved {count} reviews to {filename}", foreground="green"
+        )
+
+    def run_scraper(self, company, start, end, source):
+        key = cache_key(source, company, start, end)
+        cached = load_cached(key)
+        if cached is not None:
+            # reviews stays serialized and is written to the output untouched
+            count, reviews = cached
+        else:
+            scraper = self._scrapers.result().get(source)
+            if scraper is None:
+                raise ValueError(f"Unknown source selected: {source}")
+            reviews = scraper(company, start, end, progress=self._report_progress)
+            count = len(reviews)
+            if reviews:
+                save_cached(key, reviews)
+
+        if not count:
+            return 0, None
+
+        os.makedirs("output", exist_ok=True)
+        filename = f"output/{company}_{source}_reviews.json"
+        dump_reviews(reviews, filename)
+
+        return count, filename
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     root = tk.Tk()
     app = ReviewScraperApp(root)
     root.mainloop()
\ No newline at end of file
@@ -1,10 +1,24 @@
 import argparse
-import json
+import logging
 import os
-from datetime import datetime
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from scrapers.g2 import scrape_g2
 
 from scrapers.capterra import scrape_capterra
+from utils.date_input import parse_day
+from utils.json_utils import dump_reviews, dumps
+
+SCRAPERS = {"g2": scrape_g2, "capterra": scrape_capterra}
+
+# matches the scrapers' DriverPool size, so no worker waits for a browser
+MAX_WORKERS = 4
+
+def _iso_date(value):
+    try:
+        return parse_day(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Scrape reviews from G2/Capterra")
@@ -12,42 +26,90 @@ def parse_args():
     parser.add_argument(
         "--company",
         required=True,
+        nargs="+",
         help=(
-            "Company slug or name:\n"
+            "Company slug or name; several may be given and are scraped in parallel:\n"
             "  - For G2: just the company name (e.g., 'slack')\n"
             "  - For Capterra: full slug like '135003/slack' (from the URL)"
         )
     )
     
-    parser.add_argument("--start_date", required=True, help="Start date (YYYY-MM-DD)")
-    parser.add_argument("--end_date", required=True, help="End date (YYYY-MM-DD)")
-    parser.add_argument("--source", required=True, choices=["g2", "capterra"], help="Review source")
+    parser.add_argument("--start_date", required=True, type=_iso_date, help="Start date (YYYY-MM-DD)")
+    parser.add_argument("--end_date", required=True, type=_iso_date, help="End date (YYYY-MM-DD)")
+    parser.add_argument("--source", required=True, choices=SCRAPERS, help="Review source")
+    parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="Write one review per line as it is scraped instead of a JSON array at the end",
+    )
     return parser.parse_args()
 
-def main():
-    args = parse_args()
-    start_date = datetime.strptime(args.start_date, "%Y-%m-%d")
-    end_date = datetime.strptime(args.end_date, "%Y-%m-%d")
+def scrape_one(scraper, company, source, start_date, end_date, jsonl=False):
+    safe_company = company.replace("/", "-")
+
+    if jsonl:
+        file_name = f"output/{safe_company}_{source}_reviews.jsonl"
+        count = 0
+        # Lines already written survive an interrupted scrape.
+        with open(file_name, "wb") as out_file:
+            def sink(review):
+                nonlocal count
+                out_file.write(dumps(review) + b"\n")
+                count += 1
+
+            scraper(company, start_date, end_date, sink=sink)
+        return count, file_name
 
+    reviews = scraper(company, start_date, end_date)
 
-    if args.source == "g2":
-        reviews = scrape_g2(args.company.lower(), start_date, end_date)
-    elif args.source == "capterra":
-        reviews = scrape_capterra(args.company.lower(), start_date, end_date)
-    else:
-        print("Unsupported source")
-        return
+    file_name = f"output/{safe_company}_{source}_reviews.json"
+    dump_reviews(reviews, file_name)
+    return len(reviews), file_name
+
+
+def scrape_many(companies, source, start_date, end_date, jsonl=False, workers=MAX_WORKERS):
+    # Returns ({company: (count, file_name)}, {company: exception}); one
+    # company failing never costs the others their results.
+    scraper = SCRAPERS[source]
+    results, failures = {}, {}
+    # Scrapes spend nearly all their time waiting on the browser, so threads
+    # overlap well despite the GIL.
+    with ThreadPoolExecutor(max_workers=min(workers, len(companies))) as ex:
+        futures = {
+            ex.submit(scrape_one, scraper, company, source, start_date, end_date, jsonl): company
+            for company in companies
+        }
+        for future in as_completed(futures):
+            company = futures[future]
+            try:
+                results[company] = future.result()
+            except Exception as e:
+                failures[company] = e
+    return results, failures
+
+
+def main():
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    start_date = args.start_date
+    end_date = args.end_date
 
     if not os.path.exists("output"):
         os.makedirs("output")
 
-    safe_company = args.company.lower().replace("/", "-")
-    
-    file_name = f"output/{safe_company}_{args.source}_reviews.json"
-    with open(file_name, "w", encoding="utf-8") as f:
-        json.dump(reviews, f, indent=2, ensure_ascii=False)
+    # the same company given twice would race on one output file
+    companies = list(dict.fromkeys(company.lower() for company in args.company))
+    results, failures = scrape_many(companies, args.source, start_date, end_date, args.jsonl)
+
+    for company in companies:
+        if company in results:
+            count, file_name = results[company]
+            print(f"Saved {count} reviews to {file_name}")
+        else:
+            print(f"Failed to scrape {company}: {failures[company]!r}", file=sys.stderr)
 
-    print(f"Saved {len(reviews)} reviews to {file_name}")
+    if failures:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
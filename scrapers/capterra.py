@@ -1,176 +1,314 @@
 import json
+import logging
+import re
 import time
 import random
 from datetime import datetime
+from functools import partial
+from urllib.parse import urlencode, urljoin
 
-import dateparser
+import requests
 import undetected_chromedriver as uc
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selectolax.lexbor import LexborHTMLParser
+
+from utils.browser import (
+    DriverPool,
+    block_static_assets,
+    chromedriver_path,
+    configure_timeouts,
+    disable_images,
+    get_with_retry,
+    new_wait,
+)
+from utils.date_utils import parse_date
+
+
+logger = logging.getLogger(__name__)
+
+CAPTERRA_SEARCH_URL = "https://www.capterra.in/search/product"
+_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+_HTTP_TIMEOUT = 15
+
+_PRODUCT_LINK = 'a[href*="/software/"]'
+_REVIEW_CONTAINER = '[data-entity="review"]'
+_NEXT_PAGE = 'a[rel="next"]'
+_REVIEWER_NAME = ".h5.fw-bold.mb-2"
+_RATING = ".star-rating-component .ms-1"
+_DATE_SPAN = ".ms-2"
+_REVIEW_TITLE = "h3.h5.fw-bold"
+# substring match, like the keyword test it replaces ("months" still hits "month")
+_DATE_SPAN_RE = re.compile(r"ago|month|year|last", re.IGNORECASE)
+
+# Scrolls inside the page until the document height has been stable for 1s,
+# so lazy-loaded content is in place after a single driver round-trip. Gives
+# up after arguments[0] ms on pages that never settle (rotating ads etc.).
+_SCROLL_MAX_MS = 10000
+_SCROLL_TO_BOTTOM_JS = """
+const maxMs = arguments[0];
+const done = arguments[arguments.length - 1];
+const started = performance.now();
+let lastHeight = -1;
+let stableSince = started;
+function step() {
+    const height = document.body.scrollHeight;
+    window.scrollTo(0, height);
+    const now = performance.now();
+    if (height !== lastHeight) {
+        lastHeight = height;
+        stableSince = now;
+    }
+    if (now - stableSince >= 1000 || now - started >= maxMs) {
+        done();
+        return;
+    }
+    setTimeout(step, 150 + Math.random() * 250);
+}
+step();
+"""
+
+
+# The search results page is static HTML, so it is fetched without a browser.
+_HTTP = requests.Session()
+_HTTP.headers["User-Agent"] = _USER_AGENT
+_HTTP.mount(
+    "https://",
+    HTTPAdapter(
+        pool_maxsize=10,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504)),
+    ),
+)
+
+
+_OUTER_HTML_JS = "return Array.from(document.querySelectorAll(arguments[0]), (el) => el.outerHTML);"
+
+
+def _node_text(node, default=""):
+    return node.text(separator=" ", strip=True) if node is not None else default
+
+
+def _review_date_text(tree):
+    for span in tree.css(_DATE_SPAN):
+        text = _node_text(span)
+        if _DATE_SPAN_RE.search(text):
+            return text
+    return None
+
+
+def _new_driver(headless):
+    options = uc.ChromeOptions()
+    options.headless = headless
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.page_load_strategy = "eager"
+    disable_images(options)
+    options.add_argument(f"--user-agent={_USER_AGENT}")
+    driver = uc.Chrome(options=options, driver_executable_path=chromedriver_path())
+    configure_timeouts(driver)
+    block_static_assets(driver)
+    return driver
+
+
+# headless mode is fixed when Chrome starts, so each mode gets its own pool
+_DRIVERS = {headless: DriverPool(partial(_new_driver, headless)) for headless in (True, False)}
+
+
+def _search_product_over_http(company_name):
+    try:
+        response = _HTTP.get(CAPTERRA_SEARCH_URL, params={"q": company_name}, timeout=_HTTP_TIMEOUT)
+        response.raise_for_status()
+    except requests.RequestException:
+        return None
+    node = LexborHTMLParser(response.text).css_first(_PRODUCT_LINK)
+    href = node.attributes.get("href") if node is not None else None
+    return urljoin(response.url, href) if href else None
 
 
 class CapterraSeleniumScraper:
     def __init__(self, headless=True):
-        options = uc.ChromeOptions()
-        options.headless = headless
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_argument(
-            "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
-        self.driver = uc.Chrome(options=options)
-        self.wait = WebDriverWait(self.driver, 20)
+        self._pool = _DRIVERS[bool(headless)]
+        self._driver = None
+        self._last_request_ts = 0.0
+
+    @property
+    def driver(self):
+        # Chrome is only needed once a search has found the product page.
+        if self._driver is None:
+            self._driver = self._pool.acquire()
+        return self._driver
+
+    @property
+    def wait(self):
+        return new_wait(self.driver, 20)
+
+    def _polite_delay(self, min_delay, max_delay):
+        # Time already spent since the last navigation (page load, scrolling,
+        # parsing) counts towards the delay.
+        needed = random.uniform(min_delay, max_delay) - (time.monotonic() - self._last_request_ts)
+        if needed > 0:
+            time.sleep(needed)
 
     def scroll_to_bottom(self):
-        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(random.uniform(2, 4))
+        try:
+            self.driver.execute_async_script(_SCROLL_TO_BOTTOM_JS, _SCROLL_MAX_MS)
+        except TimeoutException:
+            # scrolling only helps lazy content load; read what is there
+            logger.warning("⚠️ Scrolling timed out; continuing with the loaded content")
 
     def get_review_url_from_search(self, company_name):
-        print(f"🔍 Searching Capterra for '{company_name}'...")
-        search_url = f"https://www.capterra.in/search/product?q={company_name}"
-        self.driver.get(search_url)
+        logger.info("🔍 Searching Capterra for '%s'...", company_name)
+        product_href = _search_product_over_http(company_name) or self._search_product_in_browser(company_name)
+        if not product_href:
+            logger.warning("❌ No product found for this company.")
+            return None
+
+        logger.info("✅ Found product URL: %s", product_href)
+        return product_href.replace("/software/", "/reviews/") if "/software/" in product_href else None
+
+    def _search_product_in_browser(self, company_name):
+        # fallback for when the plain HTTP request is blocked or the results
+        # need JavaScript
+        search_url = f"{CAPTERRA_SEARCH_URL}?{urlencode({'q': company_name})}"
+        get_with_retry(self.driver, search_url)
         self.scroll_to_bottom()
 
         try:
-            product_card = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'a[href*="/software/"]')))
-            product_href = product_card.get_attribute("href")
-            print(f"✅ Found product URL: {product_href}")
-            return product_href.replace("/software/", "/reviews/") if "/software/" in product_href else None
+            product_card = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, _PRODUCT_LINK)))
+            return product_card.get_attribute("href")
         except TimeoutException:
-            print("❌ No product found for this company.")
             return None
 
-    def extract_reviews_with_pagination(self, base_url, start_date, end_date):
-        self.driver.get(base_url)
-        time.sleep(random.uniform(4, 6))
+    def extract_reviews_with_pagination(self, base_url, start_date, end_date, progress=None, sink=None):
+        self._last_request_ts = time.monotonic()
+        get_with_retry(self.driver, base_url)
+        self._polite_delay(4, 6)
 
         try:
             most_recent_radio = self.wait.until(
                 EC.element_to_be_clickable((By.ID, "opt_most_recent"))
             )
+            self._last_request_ts = time.monotonic()
             self.driver.execute_script("arguments[0].click();", most_recent_radio)
-            print("✅ Clicked 'Most Recent' filter")
-            time.sleep(3)
+            logger.info("✅ Clicked 'Most Recent' filter")
+            self._polite_delay(3, 3)
         except Exception as e:
-            print(f"⚠️ Could not apply 'Most Recent' filter: {e}")
+            logger.warning("⚠️ Could not apply 'Most Recent' filter: %s", e)
 
+        # one reference instant for every "N months ago" on every page
+        now = datetime.now()
         all_reviews = []
+        emit = sink or all_reviews.append
+        count = 0
         page_number = 1
 
         while True:
-            print(f"\n📄 Processing Page {page_number}")
+            logger.info("📄 Processing Page %d", page_number)
+            if progress:
+                progress(page_number, count)
             self.scroll_to_bottom()
 
             try:
-                review_containers = self.wait.until(
-                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, '[data-entity="review"]'))
+                first_review = self.wait.until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, _REVIEW_CONTAINER))
                 )
             except TimeoutException:
-                print("❌ No reviews found or timeout occurred.")
+                logger.warning("❌ No reviews found or timeout occurred.")
                 break
 
-            for container in review_containers:
-                review = self._extract_review(container)
-                if not review:
-                    continue
-
-                parsed_date = dateparser.parse(review.get("review_date", ""))
+            # every card's markup in one round-trip instead of one per card
+            for card_html in self.driver.execute_script(_OUTER_HTML_JS, _REVIEW_CONTAINER):
+                tree = LexborHTMLParser(card_html)
+                # Only cards inside the date range get their other fields read.
+                date_text = _review_date_text(tree)
+                parsed_date = parse_date(date_text, now=now)
                 if not parsed_date:
                     continue
 
-                if start_date <= parsed_date <= end_date:
-                    review["review_date_parsed"] = parsed_date.strftime("%Y-%m-%d")
-                    all_reviews.append(review)
-                    
                 if parsed_date < start_date:
-                    print("⏩ Skipping old review (before start_date)")
+                    logger.info("⏩ Skipping old review (before start_date)")
                     return all_reviews
-                    # continue
+                if parsed_date > end_date:
+                    continue
 
+                review = self._extract_review(tree, date_text)
+                if not review:
+                    continue
+
+                review["review_date_parsed"] = parsed_date.strftime("%Y-%m-%d")
+                emit(review)
+                count += 1
 
             try:
-                next_button = self.driver.find_element(By.CSS_SELECTOR, 'a[rel="next"]')
+                next_button = self.driver.find_element(By.CSS_SELECTOR, _NEXT_PAGE)
                 if not next_button.is_enabled():
                     break
-                print("➡️ Clicking next page...")
+                logger.info("➡️ Clicking next page...")
                 next_button.click()
-                time.sleep(random.uniform(8, 12))
+                # Move on as soon as the old cards are gone instead of sleeping
+                # for the slowest page; the loop then waits for the new ones.
+                new_wait(self.driver, 15).until(EC.staleness_of(first_review))
                 page_number += 1
             except NoSuchElementException:
-                print("✅ No more pages.")
+                logger.info("✅ No more pages.")
+                break
+            except TimeoutException:
+                logger.warning("❌ Next page did not load.")
                 break
 
         return all_reviews
 
-    def _extract_review(self, container):
+    def _extract_review(self, tree, date_text):
         try:
             review = {}
 
-            try:
-                review["reviewer_name"] = container.find_element(By.CSS_SELECTOR, ".h5.fw-bold.mb-2").text.strip()
-            except NoSuchElementException:
-                review["reviewer_name"] = "Anonymous"
-
-            try:
-                review["rating"] = container.find_element(By.CSS_SELECTOR, ".star-rating-component .ms-1").text.strip()
-            except NoSuchElementException:
-                review["rating"] = ""
-
-            try:
-                for span in container.find_elements(By.CSS_SELECTOR, ".ms-2"):
-                    text = span.text.strip().lower()
-                    if any(kw in text for kw in ["ago", "month", "year", "last"]):
-                        review["review_date"] = span.text.strip()
-                        break
-            except NoSuchElementException:
-                review["review_date"] = ""
-
-            try:
-                review["review_title"] = container.find_element(By.CSS_SELECTOR, "h3.h5.fw-bold").text.strip()
-            except NoSuchElementException:
-                review["review_title"] = ""
+            review["reviewer_name"] = _node_text(tree.css_first(_REVIEWER_NAME), "Anonymous")
+            review["rating"] = _node_text(tree.css_first(_RATING))
+            review["review_date"] = date_text
+            review["review_title"] = _node_text(tree.css_first(_REVIEW_TITLE))
 
-            try:
-                for p in container.find_elements(By.TAG_NAME, "p"):
-                    if "Comments:" in p.text:
-                        review["main_comment"] = p.text.split("Comments:", 1)[1].strip()
-                        break
-            except NoSuchElementException:
-                review["main_comment"] = ""
+            for p in tree.css("p"):
+                text = _node_text(p)
+                if "Comments:" in text:
+                    review["main_comment"] = text.split("Comments:", 1)[1].strip()
+                    break
 
             return review
 
         except Exception as e:
-            print(f"❌ Error parsing review: {e}")
+            logger.warning("❌ Error parsing review: %s", e)
             return None
 
     def close(self):
-        self.driver.quit()
+        if self._driver is not None:
+            self._pool.release(self._driver)
+            self._driver = None
 
-    def scrape(self, company_name: str, start: datetime, end: datetime):
+    def scrape(self, company_name: str, start: datetime, end: datetime, progress=None, sink=None):
         try:
             review_url = self.get_review_url_from_search(company_name)
             if not review_url:
-                print(f"❌ Could not find review page for: {company_name}")
+                logger.warning("❌ Could not find review page for: %s", company_name)
                 return []
 
-            print(f"\n🚀 Scraping reviews from: {review_url}")
-            print(f"📅 Date range: {start.date()} to {end.date()}")
+            logger.info("🚀 Scraping reviews from: %s", review_url)
+            logger.info("📅 Date range: %s to %s", start.date(), end.date())
             
-            reviews = self.extract_reviews_with_pagination(review_url, start, end)
+            reviews = self.extract_reviews_with_pagination(review_url, start, end, progress, sink)
             return reviews
 
         except Exception as e:
-            print(f"❌ Scraping failed: {e}")
+            logger.error("❌ Scraping failed: %s", e)
             return []
         finally:
             self.close()
 
 
 
-def scrape_capterra(company, start_date, end_date):
+def scrape_capterra(company, start_date, end_date, progress=None, sink=None):
     scraper = CapterraSeleniumScraper(headless=True) 
-    return scraper.scrape(company_name=company, start=start_date, end=end_date)
+    return scraper.scrape(company_name=company, start=start_date, end=end_date, progress=progress, sink=sink)
@@ -1,15 +1,53 @@
 # scrapers/g2.py
+import logging
+
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+import re
 import time
+from datetime import datetime
+
+from utils.browser import (
+    DriverPool,
+    block_static_assets,
+    chromedriver_path,
+    configure_timeouts,
+    disable_images,
+    get_with_retry,
+    is_challenge_page,
+    new_wait,
+)
+from utils.date_utils import parse_date
+
+logger = logging.getLogger(__name__)
+
+_BLOCKS = "div.paper__bd"
+_TITLE = 'div[itemprop="name"]'
+_REVIEW_PARAS = 'div[itemprop="reviewBody"] p.formatted-text'
+_DATE = 'meta[itemprop="datePublished"]'
+_STARS = "div.stars"
+_STARS_RE = re.compile(r"(?:^|\s)stars-(\d+)")
 
-from utils.date_utils import normalize_date, is_within_range
+# Pulls every review's fields out in the browser, so each page costs one
+# round-trip instead of serializing the whole DOM back through page_source.
+_EXTRACT_REVIEWS_JS = """
+const [blocksSel, titleSel, parasSel, dateSel, starsSel] = arguments;
+return Array.from(document.querySelectorAll(blocksSel), (block) => {
+    const title = block.querySelector(titleSel);
+    const date = block.querySelector(dateSel);
+    const stars = block.querySelector(starsSel);
+    return {
+        title: title ? title.textContent.trim() : null,
+        review: Array.from(block.querySelectorAll(parasSel), (p) => p.textContent.trim()).join("\\n"),
+        date: date ? date.getAttribute("content") : null,
+        stars: stars ? stars.className : "",
+    };
+});
+"""
 
 
-def scrape_g2(company_slug, start_date, end_date):
+def _new_driver():
     options = uc.ChromeOptions()
     
     # to not show the browser window
@@ -20,67 +58,100 @@ def scrape_g2(company_slug, start_date, end_date):
     options.add_argument("--window-size=1920,1080")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-gpu")
+    # return from driver.get at DOMContentLoaded; the explicit waits in _scrape_reviews cover the rest
+    options.page_load_strategy = "eager"
+    disable_images(options)
     
 
-    print("[*] Launching undetected Chrome browser...")
-    driver = uc.Chrome(options=options)
+    logger.info("[*] Launching undetected Chrome browser...")
+    driver = uc.Chrome(options=options, driver_executable_path=chromedriver_path())
+    configure_timeouts(driver)
+    block_static_assets(driver)
+    return driver
+
+
+_DRIVERS = DriverPool(_new_driver)
+
+
+def scrape_g2(company_slug, start_date, end_date, progress=None, sink=None):
+    # With a sink, each review is handed over as soon as it is scraped and the
+    # returned list stays empty.
+    driver = _DRIVERS.acquire()
+    try:
+        return _scrape_reviews(driver, company_slug, start_date, end_date, progress, sink)
+    finally:
+        _DRIVERS.release(driver)
+
+
+def _scrape_reviews(driver, company_slug, start_date, end_date, progress, sink):
     url = f"https://www.g2.com/products/{company_slug}/reviews"
-    print(f"[*] Navigating to: {url}")
-    driver.get(url)
+    logger.info("[*] Navigating to: %s", url)
+    get_with_retry(driver, url)
 
     try:
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "div.paper__bd"))
+        new_wait(driver, 20).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, _BLOCKS))
         )
     except:
         driver.save_screenshot("output/g2_blocked.png")
-        print("❌ Reviews not loaded — likely blocked. Screenshot saved.")
-        driver.quit()
+        if is_challenge_page(driver):
+            logger.warning("❌ Reviews not loaded — blocked by a bot challenge. Screenshot saved.")
+        else:
+            logger.warning("❌ Reviews not loaded — likely blocked. Screenshot saved.")
         return []
 
-    print("[*] Reviews loaded. Parsing...")
+    logger.info("[*] Reviews loaded. Parsing...")
     reviews = []
+    emit = sink or reviews.append
+    count = 0
     page = 1
 
     while True:
-        print(f"📄 Scraping page {page}...")
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        blocks = soup.select("div.paper__bd")
+        logger.info("📄 Scraping page %d...", page)
+        if progress:
+            progress(page, count)
+        blocks = driver.execute_script(
+            _EXTRACT_REVIEWS_JS, _BLOCKS, _TITLE, _REVIEW_PARAS, _DATE, _STARS
+        )
         if not blocks:
-            print("[!] No more reviews found.")
+            logger.info("[!] No more reviews found.")
             break
 
+        earliest_on_page = None
         for block in blocks:
             try:
-                
-                title_tag = block.select_one('div[itemprop="name"]')
-                review_paras = block.select('div[itemprop="reviewBody"] p.formatted-text')
-                date_tag = block.select_one('meta[itemprop="datePublished"]')
-                rating_div = block.select_one('div.stars')
-
-                title = title_tag.get_text(strip=True) if title_tag else None
-                review = "\n".join(p.get_text(strip=True) for p in review_paras)
-                date_raw = date_tag.get("content") if date_tag else None
-                date = normalize_date(date_raw)
-                if not is_within_range(date_raw, start_date, end_date):
+                date_raw = block["date"]
+                try:
+                    # datePublished is ISO-8601 ("2024-03-15" or with a time part)
+                    published = datetime.fromisoformat(date_raw[:10])
+                except (TypeError, ValueError):
+                    published = parse_date(date_raw)
+                if published is None:
                     continue
+                if earliest_on_page is None or published < earliest_on_page:
+                    earliest_on_page = published
+                if not (start_date <= published <= end_date):
+                    continue
+                date = published.date().isoformat()
 
-                rating = None
-                if rating_div:
-                    for cls in rating_div.get("class", []):
-                        if cls.startswith("stars-"):
-                            rating = int(cls.split("-")[1]) / 2
+                stars = _STARS_RE.search(block["stars"])
+                rating = int(stars.group(1)) / 2 if stars else None
 
-                reviews.append({
-                    "title": title,
-                    "review": review,
+                emit({
+                    "title": block["title"],
+                    "review": block["review"],
                     "date": date,
                     "rating": rating,
                     "source": "G2"
                 })
+                count += 1
             except Exception as e:
                 continue
 
+        # Reviews are listed newest first, so later pages are all older still.
+        if earliest_on_page is not None and earliest_on_page < start_date:
+            break
+
         try:
             next_btn = driver.find_element(By.CSS_SELECTOR, ".pagination__item--next a")
             next_btn.click()
@@ -89,6 +160,5 @@ def scrape_g2(company_slug, start_date, end_date):
         except:
             break
 
-    driver.quit()
-    print(f"[✓] Scraped {len(reviews)} reviews from G2.")
+    logger.info("[✓] Scraped %d reviews from G2.", count)
     return reviews
\ No newline at end of file
@@ -0,0 +1,196 @@
+import atexit
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+
+import undetected_chromedriver as uc
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+PAGE_LOAD_TIMEOUT = 30
+NAVIGATION_RETRIES = 3
+# WebDriverWait's default 0.5s poll can add up to half a second to every wait.
+WAIT_POLL_FREQUENCY = 0.1
+
+# Review text never needs these, and fetching them dominates page load time.
+BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg",
+    "*.woff", "*.woff2", "*.css", "*.mp4",
+]
+
+# Runs in the page so only a boolean crosses the wire, not the whole document.
+_CHALLENGE_JS = "return /captcha|challenge|cloudflare/i.test(document.documentElement.innerHTML);"
+
+# 2 = block. Also covers images served without a file extension, which the
+# URL patterns above miss.
+CHROME_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+}
+
+
+_PATCH_LOCK = threading.Lock()
+_chromedriver_path = None
+_chromedriver_dir = None
+
+
+def chromedriver_path():
+    # uc.Chrome otherwise looks up, downloads and patches a fresh chromedriver
+    # for every browser it starts; do that once per process instead. uc's
+    # default location is shared by every process on the machine, so the
+    # binary goes into a private directory that is safe to delete at exit.
+    global _chromedriver_path, _chromedriver_dir
+    with _PATCH_LOCK:
+        if _chromedriver_path is None:
+            workdir = _chromedriver_dir = tempfile.mkdtemp(prefix="chromedriver-")
+            patcher = uc.Patcher()
+            patcher.executable_path = os.path.join(workdir, patcher.exe_name)
+            patcher.zip_path = os.path.join(workdir, "unzipped")
+            patcher.auto()
+            _chromedriver_path = patcher.executable_path
+        return _chromedriver_path
+
+
+def _remove_chromedriver():
+    if _chromedriver_dir is not None:
+        shutil.rmtree(_chromedriver_dir, ignore_errors=True)
+
+
+# Registered on import, before any DriverPool, so it runs after the pools have
+# quit their browsers.
+atexit.register(_remove_chromedriver)
+
+
+def configure_timeouts(driver):
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+    driver.set_script_timeout(PAGE_LOAD_TIMEOUT)
+
+
+def new_wait(driver, timeout):
+    return WebDriverWait(driver, timeout, poll_frequency=WAIT_POLL_FREQUENCY)
+
+
+def get_with_retry(driver, url, retries=NAVIGATION_RETRIES, backoff=0.5):
+    for attempt in range(retries):
+        try:
+            driver.get(url)
+            return
+        except TimeoutException:
+            if attempt == retries - 1:
+                raise
+            time.sleep(backoff * 2 ** attempt)
+
+
+def disable_images(options):
+    options.add_experimental_option("prefs", CHROME_PREFS)
+    # stops Blink from decoding and laying out images at all
+    options.add_argument("--blink-settings=imagesEnabled=false")
+
+
+def is_challenge_page(driver):
+    try:
+        return bool(driver.execute_script(_CHALLENGE_JS))
+    except WebDriverException:
+        return False
+
+
+def block_static_assets(driver):
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+
+
+class DriverPool:
+    # Chrome takes seconds to start, so finished scrapes hand their driver back
+    # for the next one instead of quitting it. A long-lived Chrome slowly leaks
+    # memory, so drivers are retired after max_uses scrapes or max_age seconds.
+    def __init__(self, factory, max_size=4, max_uses=50, max_age=300):
+        self._factory = factory
+        self._max_uses = max_uses
+        self._max_age = max_age
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle = deque()
+        self._stats = {}  # driver -> [started_at, uses]
+        self._closed = False
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def acquire(self):
+        # Blocks while max_size drivers are checked out.
+        self._slots.acquire()
+        try:
+            while True:
+                with self._lock:
+                    driver = self._idle.pop() if self._idle else None
+                if driver is None:
+                    break
+                if not self._expired(driver):
+                    return driver
+                self._retire(driver)
+
+            driver = self._factory()
+        except BaseException:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._stats[driver] = [time.monotonic(), 0]
+        return driver
+
+    def release(self, driver):
+        try:
+            with self._lock:
+                stats = self._stats.get(driver)
+                if stats is not None:
+                    stats[1] += 1
+            # no stats: close() already retired it while a scrape still held it
+            if stats is None or self._closed or self._expired(driver):
+                self._retire(driver)
+                return
+            try:
+                driver.delete_all_cookies()
+                driver.get("about:blank")
+            except WebDriverException:
+                # the browser died mid-scrape; never hand it out again
+                self._retire(driver)
+                return
+            with self._lock:
+                if not self._closed:
+                    self._idle.append(driver)
+                    return
+            # close() ran while this driver was being reset
+            self._retire(driver)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        # Runs at exit too, when a scrape on a daemon thread may still hold a
+        # driver; quit those as well so no Chrome outlives the process.
+        with self._lock:
+            self._closed = True
+            self._idle = deque()
+            drivers = list(self._stats)
+        for driver in drivers:
+            self._retire(driver)
+
+    def _expired(self, driver):
+        with self._lock:
+            stats = self._stats.get(driver)
+        if stats is None:
+            return True
+        started_at, uses = stats
+        return uses >= self._max_uses or time.monotonic() - started_at > self._max_age
+
+    def _retire(self, driver):
+        with self._lock:
+            self._stats.pop(driver, None)
+        _quit(driver)
+
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
@@ -0,0 +1,55 @@
+import hashlib
+import os
+import time
+
+from utils.json_utils import dump_reviews
+
+CACHE_DIR = os.path.join("output", ".cache")
+CACHE_TTL = 7 * 24 * 60 * 60  # 7 days
+
+
+def _canon(source, company, start_date, end_date):
+    # Inputs that only differ by case or surrounding whitespace share an entry.
+    # The bounds keep their full isoformat(): the scrapers filter on the whole
+    # datetime, so dropping the time of day would let a noon-to-noon scrape
+    # answer a midnight-to-midnight one.
+    return (
+        source.strip().lower(),
+        company.strip().lower(),
+        start_date.isoformat(),
+        end_date.isoformat(),
+    )
+
+
+def cache_key(source, company, start_date, end_date):
+    raw = "|".join(_canon(source, company, start_date, end_date))
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _cache_path(key):
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
+
+# Entries are "<review count>\n" followed by the JSON array, so a hit needs
+# neither a parse nor a re-serialization.
+def load_cached(key, ttl=CACHE_TTL):
+    # Returns (review_count, raw JSON bytes) so callers can copy the payload
+    # without re-serializing it.
+    path = _cache_path(key)
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path, "rb") as f:
+            count = int(f.readline())
+            raw = f.read()
+    except (OSError, ValueError):
+        # missing, or written before the count header existed
+        return None
+    if not (raw.startswith(b"[") and raw.rstrip().endswith(b"]")):
+        return None
+    return count, raw
+
+
+def save_cached(key, reviews):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    dump_reviews(reviews, _cache_path(key), header=b"%d\n" % len(reviews))
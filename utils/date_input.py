@@ -0,0 +1,14 @@
+import re
+from datetime import date, datetime, time
+
+_DAY_RE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+
+
+def parse_day(text):
+    # fromisoformat alone also takes "20240101", week dates, times and UTC
+    # offsets; an offset yields an aware datetime that cannot be compared with
+    # the scrapers' naive review dates. Only plain YYYY-MM-DD gets through, as
+    # a naive midnight.
+    if not _DAY_RE.fullmatch(text):
+        raise ValueError(f"invalid date {text!r}, expected YYYY-MM-DD")
+    return datetime.combine(date.fromisoformat(text), time())
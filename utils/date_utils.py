@@ -1,11 +1,111 @@
+import re
+from datetime import datetime
+from functools import lru_cache
+
 from dateparser import parse
+from dateutil.relativedelta import relativedelta
+
+_RELATIVE_UNITS = {
+    "minute": "minutes",
+    "hour": "hours",
+    "day": "days",
+    "week": "weeks",
+    "month": "months",
+    "year": "years",
+}
+_AGO_RE = re.compile(r"(\d+|an?)\s+(minute|hour|day|week|month|year)s?\s+ago", re.IGNORECASE)
+_LAST_RE = re.compile(r"last\s+(day|week|month|year)", re.IGNORECASE)
+
+_MONTHS = {
+    name: number
+    for number, names in enumerate(
+        (
+            ("jan", "january"), ("feb", "february"), ("mar", "march"),
+            ("apr", "april"), ("may",), ("jun", "june"), ("jul", "july"),
+            ("aug", "august"), ("sep", "sept", "september"), ("oct", "october"),
+            ("nov", "november"), ("dec", "december"),
+        ),
+        start=1,
+    )
+    for name in names
+}
+# 2024-03-15 (optionally followed by a time), 03/15/2024, March 15, 2024 / Mar 15 2024
+_ABSOLUTE_RE = re.compile(
+    r"(?P<y1>\d{4})-(?P<m1>\d{1,2})-(?P<d1>\d{1,2})(?:[T ].*)?"
+    r"|(?P<m2>\d{1,2})/(?P<d2>\d{1,2})/(?P<y2>\d{4})"
+    r"|(?P<mon>[a-z]+)\.?\s+(?P<d3>\d{1,2}),?\s+(?P<y3>\d{4})",
+    re.IGNORECASE,
+)
+
+
+def _parse_relative(text, now):
+    match = _AGO_RE.fullmatch(text)
+    if match:
+        amount = int(match.group(1)) if match.group(1).isdigit() else 1
+        return now - relativedelta(**{_RELATIVE_UNITS[match.group(2).lower()]: amount})
+
+    match = _LAST_RE.fullmatch(text)
+    if match:
+        return now - relativedelta(**{_RELATIVE_UNITS[match.group(1).lower()]: 1})
+
+    return None
+
+
+def _parse_absolute(text):
+    match = _ABSOLUTE_RE.fullmatch(text)
+    if not match:
+        return None
+
+    if match.group("y1"):
+        year, month, day = match.group("y1", "m1", "d1")
+    elif match.group("y2"):
+        year, month, day = match.group("y2", "m2", "d2")
+    else:
+        month = _MONTHS.get(match.group("mon").lower())
+        if month is None:
+            return None
+        year, day = match.group("y3", "d3")
+
+    try:
+        return datetime(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+
+def _parse(text, now):
+    # Review sites mostly emit "3 months ago" or fixed-layout dates; only hand
+    # anything else to the (much slower) dateparser.
+    return (
+        _parse_relative(text, now)
+        or _parse_absolute(text)
+        or parse(text, settings={"RELATIVE_BASE": now})
+    )
+
+
+# Reviews on a page share a handful of date strings ("2 months ago", ...).
+# Keyed on `now` too, so results never leak from one scrape into the next.
+_parse_cached = lru_cache(maxsize=4096)(_parse)
+
+
+def parse_date(date_str, now=None):
+    # Pass the same `now` for a whole scrape so relative dates on every page
+    # resolve against one instant.
+    if not date_str:
+        return None
+    text = date_str.strip()
+    if now is None:
+        # a fresh instant per call would never hit the cache
+        return _parse(text, datetime.now())
+    return _parse_cached(text, now)
+
 
 def is_within_range(date_str, start_date, end_date):
-    parsed_date = parse(date_str)
+    parsed_date = parse_date(date_str)
     if not parsed_date:
         return False
-    return start_date <= parsed_date.date() <= end_date
+    # bounds are datetimes, like the ones the CLI and GUI pass to the scrapers
+    return start_date <= parsed_date <= end_date
 
 def normalize_date(date_str):
-    parsed_date = parse(date_str)
+    parsed_date = parse_date(date_str)
     return parsed_date.date().isoformat() if parsed_date else None
@@ -0,0 +1,56 @@
+import json
+import os
+import tempfile
+
+_WRITE_BUFFER_SIZE = 64 * 1024
+
+try:
+    import orjson
+
+    def dumps(obj):
+        return orjson.dumps(obj)
+
+    loads = orjson.loads
+except ImportError:
+    def dumps(obj):
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    loads = json.loads
+
+
+def dump_reviews(reviews, file_name, header=b""):
+    # Write to a temp file and swap it in so a crash never leaves a truncated file.
+    # The temp name is unique, so concurrent writers of the same file (two GUI
+    # scrapes of one company) never share one.
+    f = tempfile.NamedTemporaryFile(
+        "wb",
+        # the per-review writes below are small; batch them into fewer syscalls
+        buffering=_WRITE_BUFFER_SIZE,
+        dir=os.path.dirname(file_name) or ".",
+        prefix=os.path.basename(file_name) + ".",
+        suffix=".tmp",
+        delete=False,
+    )
+    try:
+        with f:
+            f.write(header)
+            if isinstance(reviews, (bytes, bytearray)):
+                # Already serialized (e.g. a cache hit): write it through as is.
+                f.write(reviews)
+            else:
+                # One review per line keeps peak memory at a single serialized review.
+                f.write(b"[\n")
+                for i, review in enumerate(reviews):
+                    if i:
+                        f.write(b",\n")
+                    f.write(dumps(review))
+                f.write(b"\n]\n")
+        # temp files are created owner-only; give the output the usual mode
+        os.chmod(f.name, 0o644)
+        os.replace(f.name, file_name)
+    except BaseException:
+        try:
+            os.remove(f.name)
+        except OSError:
+            pass
+        raise